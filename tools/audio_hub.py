@@ -0,0 +1,324 @@
+"""Shared-memory audio analysis hub.
+
+One process owns the audio: it decodes the WAV, plays it and computes
+per-block features (RMS, log-spaced band energies and the block's
+waveform). Each block is published into a ``multiprocessing.shared_memory``
+ring together with a sequence counter, so any number of visualizer
+processes can attach read-only by name and stay in sync with playback
+without decoding or analysing the file themselves.
+
+The audio callback never takes a lock: every slot carries its own sequence
+number which the writer clears before overwriting and sets once the slot
+is complete (a per-slot seqlock). Readers check the slot's sequence number
+before and after reading its scalars, and get numpy views straight into the
+shared block for the arrays (no copies); after using ``bands``/``wave`` they
+re-check with ``HubReader.is_current`` and drop the frame if it was
+overwritten meanwhile. A slot is only reused after ``n_slots`` newer
+blocks, and ``HubReader.latest(max_age=...)`` refuses frames older than
+``max_age`` seconds, which bounds how stale a visualizer can get.
+
+Run: python tools/audio_hub.py romantic.wav --name romantic_hub
+"""
+
+import argparse
+import sys
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+DEFAULT_NAME = 'romantic_hub'
+
+_MAGIC = 0x41484231  # 'AHB1'
+# header fields (int64)
+_H_MAGIC, _H_SEQ, _H_SR, _H_BLOCK, _H_BANDS, _H_SLOTS, _H_CLOSED = range(7)
+_HEADER_LEN = 8
+
+Frame = namedtuple('Frame', 'seq time rms bands wave')
+
+
+def _layout(block, n_bands, n_slots):
+    """Return (offsets dict, total size in bytes) for a ring geometry.
+
+    The 8-byte arrays come first so every view stays naturally aligned.
+    """
+    offsets = {}
+    pos = 0
+    for key, dtype, count in (
+        ('header', np.int64, _HEADER_LEN),
+        ('slot_seq', np.int64, n_slots),
+        ('time', np.float64, n_slots),
+        ('rms', np.float32, n_slots),
+        ('bands', np.float32, n_slots * n_bands),
+        ('wave', np.float32, n_slots * block),
+    ):
+        offsets[key] = (pos, dtype, count)
+        pos += np.dtype(dtype).itemsize * count
+    return offsets, pos
+
+
+def _views(buf, block, n_bands, n_slots, writeable):
+    offsets, _ = _layout(block, n_bands, n_slots)
+    views = {}
+    for key, (off, dtype, count) in offsets.items():
+        views[key] = np.ndarray((count,), dtype=dtype, buffer=buf, offset=off)
+    views['bands'] = views['bands'].reshape(n_slots, n_bands)
+    views['wave'] = views['wave'].reshape(n_slots, block)
+    if not writeable:
+        for v in views.values():
+            v.flags.writeable = False
+    return views
+
+
+def band_edges(sr, block, n_bands, fmin=40.0):
+    """FFT bin indices splitting ``fmin..sr/2`` into log-spaced bands."""
+    n_bins = block // 2 + 1
+    freqs = np.geomspace(fmin, sr / 2.0, n_bands + 1)[:-1]
+    edges = np.round(freqs * block / float(sr)).astype(np.intp)
+    edges = np.clip(edges, 1, n_bins - 1)
+    # keep edges strictly increasing so reduceat never yields empty bands
+    for i in range(1, len(edges)):
+        edges[i] = max(edges[i], edges[i - 1] + 1)
+    return np.minimum(edges, n_bins - 1)
+
+
+class HubWriter:
+    """Owner side of the ring. Create once, call ``publish`` per block."""
+
+    def __init__(self, name, sr, block=1024, n_bands=8, n_slots=64):
+        self.sr = int(sr)
+        self.block = int(block)
+        self.n_bands = int(n_bands)
+        self.n_slots = int(n_slots)
+        _, size = _layout(self.block, self.n_bands, self.n_slots)
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._v = _views(self.shm.buf, self.block, self.n_bands, self.n_slots, writeable=True)
+        self._v['slot_seq'][:] = -1
+        self._v['time'][:] = 0.0
+        hdr = self._v['header']
+        hdr[:] = 0
+        hdr[_H_SEQ] = -1
+        hdr[_H_SR] = self.sr
+        hdr[_H_BLOCK] = self.block
+        hdr[_H_BANDS] = self.n_bands
+        hdr[_H_SLOTS] = self.n_slots
+        # readers check the magic last, so write it after the geometry
+        hdr[_H_MAGIC] = _MAGIC
+
+        self._seq = -1
+        self._window = np.hanning(self.block).astype(np.float32)
+        self._edges = band_edges(self.sr, self.block, self.n_bands)
+        self._scratch = np.zeros(self.block, dtype=np.float32)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def publish(self, chunk):
+        """Analyse one block and publish it. Safe to call from an audio callback."""
+        v = self._v
+        seq = self._seq + 1
+        slot = seq % self.n_slots
+        n = min(len(chunk), self.block)
+
+        v['slot_seq'][slot] = -1  # mark slot as being written
+        wave = v['wave'][slot]
+        wave[:n] = chunk[:n]
+        wave[n:] = 0.0
+        v['rms'][slot] = np.sqrt(np.mean(wave * wave)) if n else 0.0
+        np.multiply(wave, self._window, out=self._scratch)
+        power = np.abs(np.fft.rfft(self._scratch)) ** 2
+        v['bands'][slot] = np.add.reduceat(power, self._edges) / self.block
+        v['time'][slot] = time.monotonic()
+        v['slot_seq'][slot] = seq
+        v['header'][_H_SEQ] = seq
+        self._seq = seq
+        return seq
+
+    def close(self, unlink=True):
+        self._v['header'][_H_CLOSED] = 1
+        self._v = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _attach(name):
+    """Attach to an existing segment without registering it for cleanup.
+
+    Before Python 3.13 every attaching process registers the segment with its
+    resource tracker, which unlinks it when that process exits and pulls the
+    ring away from the hub and the other visualizers.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        except Exception:
+            pass
+        return shm
+
+
+class HubReader:
+    """Read-only view of a hub's ring. Returned arrays alias shared memory."""
+
+    def __init__(self, name=DEFAULT_NAME):
+        self.shm = _attach(name)
+        hdr = np.ndarray((_HEADER_LEN,), dtype=np.int64, buffer=self.shm.buf)
+        magic, sr, block, n_bands, n_slots = (int(hdr[i]) for i in (_H_MAGIC, _H_SR, _H_BLOCK, _H_BANDS, _H_SLOTS))
+        del hdr
+        if magic != _MAGIC:
+            self.shm.close()
+            raise RuntimeError(f'{name!r} is not an audio hub segment')
+        self.sr = sr
+        self.block = block
+        self.n_bands = n_bands
+        self.n_slots = n_slots
+        self._v = _views(self.shm.buf, self.block, self.n_bands, self.n_slots, writeable=False)
+
+    @property
+    def horizon(self):
+        """Seconds a published frame is guaranteed to stay in the ring."""
+        return (self.n_slots - 1) * self.block / float(self.sr)
+
+    @property
+    def seq(self):
+        return int(self._v['header'][_H_SEQ])
+
+    @property
+    def closed(self):
+        return bool(self._v['header'][_H_CLOSED])
+
+    def _frame(self, seq):
+        slot = seq % self.n_slots
+        v = self._v
+        if v['slot_seq'][slot] != seq:
+            return None
+        frame = Frame(seq, float(v['time'][slot]), float(v['rms'][slot]),
+                      v['bands'][slot], v['wave'][slot])
+        # the writer may have started reusing the slot while we read it
+        if v['slot_seq'][slot] != seq:
+            return None
+        return frame
+
+    def is_current(self, frame):
+        """True if ``frame``'s slot has not been overwritten since it was read.
+
+        Call this after consuming ``frame.bands`` or ``frame.wave``; they alias
+        the ring and are only trustworthy if the slot is still current.
+        """
+        return self._v['slot_seq'][frame.seq % self.n_slots] == frame.seq
+
+    def latest(self, max_age: Optional[float] = None):
+        """Return the newest complete frame, or None.
+
+        None is also returned when the newest frame is older than
+        ``max_age`` seconds (hub stalled, paused or finished).
+        """
+        seq = self.seq
+        # the writer can only be part-way through the newest slot if it
+        # lapped us, so stepping back a couple of frames always succeeds
+        for s in range(seq, max(-1, seq - 3), -1):
+            frame = self._frame(s)
+            if frame is None:
+                continue
+            if max_age is not None and time.monotonic() - frame.time > max_age:
+                return None
+            return frame
+        return None
+
+    def since(self, last_seq) -> Iterator[Frame]:
+        """Yield frames newer than ``last_seq`` in order, oldest first.
+
+        If the reader fell more than a ring behind, only the frames still
+        present are yielded. Each frame's arrays must be re-validated with
+        ``is_current`` after use.
+        """
+        seq = self.seq
+        start = max(last_seq + 1, seq - self.n_slots + 2)
+        for s in range(start, seq + 1):
+            frame = self._frame(s)
+            if frame is not None:
+                yield frame
+
+    def close(self):
+        self._v = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # a caller still holds frame views; the mapping goes away with them
+            pass
+
+
+def run_hub(path, name=DEFAULT_NAME, block=1024, n_bands=8, n_slots=64):
+    """Play ``path`` and publish its features until playback ends."""
+    import sounddevice as sd
+    import soundfile as sf
+
+    data, sr = sf.read(str(path), dtype='float32')
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    try:
+        writer = HubWriter(name, sr, block=block, n_bands=n_bands, n_slots=n_slots)
+    except FileExistsError:
+        print(f'Audio hub segment {name!r} already exists. Another hub may be running; '
+              f'if a previous hub crashed, remove /dev/shm/{name} or pick another --name.')
+        raise SystemExit(1)
+    pos = 0
+
+    def callback(outdata, frames, time_info, status):
+        nonlocal pos
+        if status:
+            print(status, file=sys.stderr)
+        chunk = data[pos:pos + frames]
+        pos += len(chunk)
+        outdata[:len(chunk), 0] = chunk
+        outdata[len(chunk):] = 0
+        writer.publish(chunk)
+
+    print(f'Audio hub {writer.name!r}: {path} @ {sr} Hz, block={block}')
+    stream = sd.OutputStream(channels=1, samplerate=sr, blocksize=block,
+                             dtype='float32', callback=callback)
+    try:
+        stream.start()
+        while pos < len(data):
+            time.sleep(0.1)
+        time.sleep(block / float(sr) * 2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        try:
+            stream.stop()
+            stream.close()
+        except Exception:
+            pass
+        writer.close()
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('wav', type=Path, nargs='?', default=None)
+    p.add_argument('--name', default=DEFAULT_NAME, help='shared memory segment name')
+    p.add_argument('--block', type=int, default=1024)
+    p.add_argument('--bands', type=int, default=8)
+    p.add_argument('--slots', type=int, default=64)
+    args = p.parse_args()
+
+    wav = args.wav
+    if wav is None:
+        smooth = Path('visual_garden/romantic_smooth.wav')
+        wav = smooth if smooth.exists() else Path('romantic.wav')
+    if not wav.exists():
+        print('Audio file not found:', wav)
+        raise SystemExit(1)
+    run_hub(wav, name=args.name, block=args.block, n_bands=args.bands, n_slots=args.slots)
+
+
+if __name__ == '__main__':
+    main()
@@ -29,10 +29,10 @@ class Flower:
         self.petal_count = random.randint(6, 12)
         self.angle = random.uniform(0, 2 * math.pi)
 
-    def draw(self, surf, now):
+    def draw(self, surf, now, pulse=1.0):
         elapsed = now - self.t
         # Animate size and rotation
-        size = self.size + 8 * math.sin(elapsed * 2)
+        size = (self.size + 8 * math.sin(elapsed * 2)) * pulse
         angle = self.angle + elapsed * 0.5
         cx, cy = self.x, self.y
         # Draw petals
@@ -57,7 +57,19 @@ class Flower:
         # Center
         pygame.draw.circle(surf, (80, 60, 40), (int(cx), int(cy)), int(size * 0.3))
 
-def main():
+def main(hub=None):
+    reader = None
+    if hub:
+        # pulse with a running tools/audio_hub.py
+        try:
+            from tools.audio_hub import HubReader
+        except ImportError:
+            from audio_hub import HubReader
+        try:
+            reader = HubReader(hub)
+        except (FileNotFoundError, RuntimeError):
+            print("Audio hub not running:", hub)
+            return
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Color Garden - Interactive Art")
@@ -87,15 +99,27 @@ def main():
         color = pygame.Color(0)
         color.hsva = (bg_hue, 40, 100, 100)
         screen.fill(color)
+        pulse = 1.0
+        if reader is not None:
+            frame = reader.latest(max_age=0.25)
+            if frame is not None:
+                pulse = 1.0 + min(1.0, frame.rms * 4)
         # Draw all flowers
         for flower in flowers:
-            flower.draw(screen, now)
+            flower.draw(screen, now, pulse)
         # Instructions
         font = pygame.font.SysFont(None, 24)
         screen.blit(font.render("Click/drag to grow flowers. Press C to change colors, F to change flower type, ESC to quit.", True, (30,30,30)), (16, HEIGHT-32))
         pygame.display.flip()
         clock.tick(FPS)
+    if reader is not None:
+        reader.close()
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hub", default=None, help="attach to a running tools/audio_hub.py by segment name")
+    args = parser.parse_args()
+    main(hub=args.hub)
@@ -1,18 +1,129 @@
+"""Synthesize audio from a spectrogram image (tools/spec_to_audio.py).
+
+Rows are frequencies (top = high), columns are time. The image is
+synthesized in vertical strips of ``--strip`` columns; no full-size float
+copy of the image is ever made.
+
+Two input modes:
+- ``mmap`` (default): convert the image once to a cached raw uint8 grayscale
+  ``.npy`` stored column-major (W, H), then memory-map it. The conversion
+  still decodes the whole PNG once (PNG cannot be decoded by region), but
+  every run after that only touches the pages of the current strip, so
+  peak memory is bounded by the strip size and synthesis starts right away.
+- ``pil``: crop each strip from the PIL image. The first crop makes PIL
+  decode the whole image and keep it resident, so memory still scales with
+  the image and the first sample waits for the full decode. Useful for
+  one-off runs where writing a cache file is not wanted.
+
+``--bins`` averages rows down to the synthesizer's bin count at load time.
+
+This is a local tool fed with our own images, so Pillow's decompression
+bomb limit (about 179M pixels) is disabled to allow gigapixel panoramas.
+
+Run: python tools/spec_to_audio.py --strip 256 --bins 512
+"""
+
+import argparse
+import os
+
 from PIL import Image
 import numpy as np
 import soundfile as sf
 from pathlib import Path
 
-spec_path = Path('visual_garden/matplotlib_music_spec.png')
+# trusted local input; see module docstring
+Image.MAX_IMAGE_PIXELS = None
+
+
+def row_edges(height, bins):
+    """Start row of each output bin when averaging ``height`` rows to ``bins``."""
+    if not bins or bins >= height:
+        return None
+    return np.linspace(0, height, bins + 1).astype(np.intp)
+
+
+def reduce_rows(strip, edges):
+    """Average a (H, w) uint8 strip into len(edges)-1 rows, as float32."""
+    if edges is None:
+        return strip.astype(np.float32)
+    sums = np.add.reduceat(strip, edges[:-1], axis=0, dtype=np.float32)
+    return sums / np.diff(edges).astype(np.float32)[:, None]
+
+
+def gray_cache(path, cache=None, band=1024):
+    """Return a read-only (W, H) uint8 memmap of ``path``, converting once.
+
+    The cache is rebuilt when the image is newer than it. Bands are
+    converted to grayscale one at a time, so only the decoded source and one
+    band are held in memory, and the cache is written to a temporary file and
+    moved into place so an interrupted conversion is never reused.
+    """
+    path = Path(path)
+    cache = Path(cache) if cache else path.with_suffix('.gray.npy')
+    if not cache.exists() or cache.stat().st_mtime < path.stat().st_mtime:
+        tmp = cache.with_name(cache.name + '.tmp')
+        try:
+            with Image.open(path) as img:
+                W, H = img.size
+                mm = np.lib.format.open_memmap(str(tmp), mode='w+', dtype=np.uint8, shape=(W, H))
+                for x0 in range(0, W, band):
+                    x1 = min(W, x0 + band)
+                    mm[x0:x1] = np.asarray(img.crop((x0, 0, x1, H)).convert('L')).T
+                mm.flush()
+                del mm
+            os.replace(tmp, cache)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+    return np.load(str(cache), mmap_mode='r')
+
+
+class SpecStrips:
+    """Iterate a spectrogram image as float32 (bins, w) column strips."""
+
+    def __init__(self, path, strip=256, bins=None, mode='mmap'):
+        self.strip = int(strip)
+        if mode == 'mmap':
+            self._mm = gray_cache(path)
+            self._img = None
+            self.width, self.src_height = self._mm.shape
+        elif mode == 'pil':
+            self._mm = None
+            self._img = Image.open(path)
+            self.width, self.src_height = self._img.size
+        else:
+            raise ValueError(f'unknown mode {mode!r}')
+        self._edges = row_edges(self.src_height, bins)
+        self.height = self.src_height if self._edges is None else len(self._edges) - 1
+
+    def __iter__(self):
+        for x0 in range(0, self.width, self.strip):
+            x1 = min(self.width, x0 + self.strip)
+            if self._mm is not None:
+                raw = self._mm[x0:x1].T
+            else:
+                raw = np.asarray(self._img.crop((x0, 0, x1, self.src_height)).convert('L'))
+            yield x0, reduce_rows(raw, self._edges)
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument('spec', type=Path, nargs='?', default=Path('visual_garden/matplotlib_music_spec.png'))
+parser.add_argument('--strip', type=int, default=256, help='columns decoded per strip')
+parser.add_argument('--bins', type=int, default=None, help='average rows down to this many frequency bins')
+parser.add_argument('--mode', choices=('mmap', 'pil'), default='mmap',
+                    help='mmap: bounded memory via a cached grayscale .npy (default); '
+                         'pil: crop from the decoded image, memory scales with the image')
+args = parser.parse_args()
+
+spec_path = args.spec
 if not spec_path.exists():
     print('Spec image not found:', spec_path.resolve())
     raise SystemExit(1)
 
-img = Image.open(spec_path).convert('L')
-arr = np.array(img).astype(np.float32)
-# arr shape: (H, W) where vertical is frequency (top=high)
-H, W = arr.shape
-print('Loaded spec', W, 'x', H)
+strips = SpecStrips(spec_path, strip=args.strip, bins=args.bins, mode=args.mode)
+# strips yield (H, w) blocks where vertical is frequency (top=high)
+H, W = strips.height, strips.width
+print('Loaded spec', W, 'x', strips.src_height, '->', H, 'bins')
 
 duration = 30.0  # seconds
 sr = 44100
@@ -27,27 +138,29 @@ time_per_col = duration / W
 col_samples = int(time_per_col * sr)
 
 phase = np.zeros(H)
-for x in range(W):
-    col = arr[:, x] / 255.0  # 0..1 magnitude
-    t0 = int(x * col_samples)
-    t1 = min(samples, t0 + col_samples)
-    t = np.arange(t1 - t0) / sr
-    frame = np.zeros(t1 - t0, dtype=np.float32)
-    # synthesize limited number of partials per column for speed
-    idxs = np.where(col > 0.05)[0]
-    if len(idxs) > 60:  # limit to strongest 60 bins
-        idxs = idxs[np.argsort(col[idxs])][-60:]
-    for i in idxs:
-        amp = col[i]
-        f = freqs[i]
-        # incremental phase to avoid clicks
-        p = phase[i]
-        frame += amp * np.sin(2 * np.pi * f * t + p)
-        phase[i] = (p + 2 * np.pi * f * (t[-1] if len(t) else 0)) % (2*np.pi)
-    # apply gentle envelope
-    env = np.linspace(0,1,len(frame))
-    frame *= env * 0.8
-    out[t0:t1] += frame
+for x0, block in strips:
+    for j in range(block.shape[1]):
+        x = x0 + j
+        col = block[:, j] / 255.0  # 0..1 magnitude
+        t0 = int(x * col_samples)
+        t1 = min(samples, t0 + col_samples)
+        t = np.arange(t1 - t0) / sr
+        frame = np.zeros(t1 - t0, dtype=np.float32)
+        # synthesize limited number of partials per column for speed
+        idxs = np.where(col > 0.05)[0]
+        if len(idxs) > 60:  # limit to strongest 60 bins
+            idxs = idxs[np.argsort(col[idxs])][-60:]
+        for i in idxs:
+            amp = col[i]
+            f = freqs[i]
+            # incremental phase to avoid clicks
+            p = phase[i]
+            frame += amp * np.sin(2 * np.pi * f * t + p)
+            phase[i] = (p + 2 * np.pi * f * (t[-1] if len(t) else 0)) % (2*np.pi)
+        # apply gentle envelope
+        env = np.linspace(0,1,len(frame))
+        frame *= env * 0.8
+        out[t0:t1] += frame
 
 # normalize
 out /= np.max(np.abs(out) + 1e-9)
@@ -15,30 +15,48 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from collections import deque
+import argparse
 import sys
 
 
 wav = 'romantic.wav'  # path (update if needed)
-data, sr = sf.read(wav)
-if data.ndim > 1:
-    data = data.mean(axis=1)  # mix to mono
+data, sr = None, None
 
 # Playback / buffer parameters
 blocksize = 1024
 buffer_seconds = 8
-buffer_len = int(buffer_seconds * sr)
-buf = deque(np.zeros(buffer_len, dtype=np.float32), maxlen=buffer_len)
+buffer_len = None
+buf = None
 
 # Smoothing (exponential low-pass) parameters
 # cutoff frequency in Hz for audio smoothing (lower = smoother)
 cutoff_hz = 6000.0
-dt = 1.0 / sr
-rc = 1.0 / (2 * np.pi * cutoff_hz)
-alpha = dt / (rc + dt)
+alpha = None
 prev_sample = 0.0
 
 pos = 0
 
+
+def setup(sample_rate):
+    """Size the display buffer and smoothing filter for ``sample_rate``."""
+    global sr, buffer_len, buf, alpha
+    sr = sample_rate
+    buffer_len = int(buffer_seconds * sr)
+    buf = deque(np.zeros(buffer_len, dtype=np.float32), maxlen=buffer_len)
+    dt = 1.0 / sr
+    rc = 1.0 / (2 * np.pi * cutoff_hz)
+    alpha = dt / (rc + dt)
+
+
+def load(path):
+    """Decode ``path`` to mono for local playback."""
+    global data
+    data, rate = sf.read(path)
+    if data.ndim > 1:
+        data = data.mean(axis=1)  # mix to mono
+    setup(rate)
+
+
 def smooth_chunk(chunk):
     """Apply exponential smoothing to a 1-D numpy chunk in-place.
     Uses a simple recursive filter y[n] = alpha * x[n] + (1-alpha) * y[n-1]
@@ -74,10 +92,28 @@ def callback(outdata, frames, time, status):
         buf.append(v)
 
 
-def main():
-    # Start playback stream
-    stream = sd.OutputStream(channels=1, samplerate=sr, blocksize=blocksize, callback=callback)
-    stream.start()
+def main(hub=None):
+    reader = None
+    stream = None
+    if hub:
+        # follow a running tools/audio_hub.py instead of decoding and
+        # playing the file here
+        try:
+            from tools.audio_hub import HubReader
+        except ImportError:
+            from audio_hub import HubReader
+        try:
+            reader = HubReader(hub)
+        except (FileNotFoundError, RuntimeError):
+            print('Audio hub not running:', hub)
+            raise SystemExit(1)
+        setup(reader.sr)
+    else:
+        load(wav)
+        # Start playback stream
+        stream = sd.OutputStream(channels=1, samplerate=sr, blocksize=blocksize, callback=callback)
+        stream.start()
+    last_seq = -1
 
     # Setup Matplotlib live plot
     plt.style.use('dark_background')
@@ -88,9 +124,16 @@ def main():
     ax.set_xlim(-buffer_seconds, 0)
     ax.set_xlabel('seconds')
     ax.set_ylabel('amplitude')
-    ax.set_title('Realtime waveform - romantic.wav (smoothed)')
+    ax.set_title(f'Realtime waveform - hub {hub}' if reader else f'Realtime waveform - {wav} (smoothed)')
 
     def update(frame):
+        nonlocal last_seq
+        if reader is not None:
+            for f in reader.since(last_seq):
+                wave = f.wave.copy()
+                if reader.is_current(f):
+                    buf.extend(wave)
+                last_seq = f.seq
         arr = np.array(buf)
         # light moving-average smoothing for display
         window = 5
@@ -107,12 +150,20 @@ def main():
         plt.show()
     finally:
         # ensure stream is closed when window closes
-        try:
-            stream.stop()
-            stream.close()
-        except Exception:
-            pass
+        if reader is not None:
+            reader.close()
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception:
+                pass
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('wav', nargs='?', default=wav)
+    parser.add_argument('--hub', default=None, help='attach to a running tools/audio_hub.py by segment name')
+    args = parser.parse_args()
+    wav = args.wav
+    main(hub=args.hub)